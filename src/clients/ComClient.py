@@ -16,7 +16,8 @@ def validate_id(id_number: int) -> bool:
     :param id_number: Can be any of vendor ID or product ID.
     :return: Flag to indicate whether the ID is valid.
     """
-    return 0 <= id_number < 65536
+    # Valid IDs are unsigned 16-bit integers, i.e. no bits are set beyond the lowest 16 (including the sign)
+    return not id_number & ~0xFFFF
 
 
 class ComClient(ThreadedClient):
@@ -27,6 +28,7 @@ class ComClient(ThreadedClient):
     BAUD_RATE = 115200
     BOOT_TIME_SECONDS = 8.0
     MAX_TIME_WITHOUT_NEW_BIT = 5.0
+    READ_TIMEOUT_SECONDS = 0.05
     PARITY = serial.PARITY_NONE
     STOP_BIT = serial.STOPBITS_ONE
     BYTE_SIZE = serial.EIGHTBITS
@@ -52,7 +54,8 @@ class ComClient(ThreadedClient):
         super().__init__(kind='Serial')
 
         # Serial port parameters (blocking)
-        self._ser = serial.Serial(baudrate=baud, parity=parity, stopbits=stopbits, bytesize=byte, dsrdtr=None)
+        self._ser = serial.Serial(baudrate=baud, parity=parity, stopbits=stopbits, bytesize=byte, dsrdtr=None,
+                                  timeout=self.READ_TIMEOUT_SECONDS)
         self.port = port
         self.send_encoding, self.read_encoding = encodings or (self.DEFAULT_WRITE_ENCODING, self.DEFAULT_READ_ENCODING)
         self.terminator = '\n'
@@ -185,8 +188,8 @@ class ComClient(ThreadedClient):
                 t0 = time()
 
             try:
-                # Attempt to read new bits
-                self.buffer += self._ser.read_all()
+                # Wait for new bits (bounded by the read timeout) and take all the bits that are already available
+                self.buffer += self._ser.read(max(1, self._ser.in_waiting))
             except SerialException as e:
                 logging.error(e)
 
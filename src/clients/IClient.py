@@ -1,10 +1,15 @@
 import abc
+from typing import List
+
+from src.ApplicationExceptions import ApiException
 
 
 class Msg:
     """
     Message object to be used internally in the clients.
     """
+    # One object is created per message sent, so avoid a per-instance dictionary
+    __slots__ = ('msg', 'ss', 'sr')
 
     def __init__(self, msg, silent_send, silent_recv):
         self.msg = msg
@@ -107,6 +112,28 @@ class IClient(metaclass=abc.ABCMeta):
     def receive(self, silence_errors=False):
         pass
 
+    def receive_n(self, count: int, silence_errors=False) -> List[str]:
+        """
+        Get the next responses at once. Can be overriden, defaults to receiving them one by one.
+        All responses are collected before an error response is raised so that later responses are not mixed up.
+        :param count: Number of responses to be received
+        :param silence_errors: Specify whether exceptions should be silenced.
+        :return: List of message strings
+        :raises: ApiException of the first error response, any other exception immediately
+        """
+        responses = []
+        error = None
+        for _ in range(count):
+            try:
+                responses.append(self.receive(silence_errors))
+            except ApiException as e:
+                # Keep on receiving after error responses, any other failure is raised immediately
+                error = error or e
+
+        if error is not None:
+            raise error
+        return responses
+
     @property
     @abc.abstractmethod
     def is_connected(self) -> bool:
@@ -81,6 +81,9 @@ class TcpClientR3(ThreadedClient):
             # Set a timeout to make this deterministic and testable on all machines
             self.s.settimeout(self.timeout)
 
+            # Commands are small request-reply pairs, Nagle's algorithm would only delay them
+            self.s.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+
             peer_name = f'{self.host}:{self.port}'
             logging.info(f'Attempting TCP connection to {peer_name}')
             self.s.connect((self.host, self.port))
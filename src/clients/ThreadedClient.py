@@ -2,8 +2,10 @@ import abc
 import logging
 import threading
 from queue import Queue, Empty
-from typing import Optional
+from time import monotonic
+from typing import Optional, List
 
+from src.ApplicationExceptions import ApiException
 from src.clients.IClient import IClient, Msg, ClientError
 
 
@@ -214,6 +216,43 @@ class ThreadedClient(IClient):
             return self.hook_post_receive(response, silence_errors)
         raise ClientError('Client needs to be connected before sending since this could lead to unexpected behavior.')
 
+    def receive_n(self, count: int, silence_errors=False, timeout: Optional[float] = None) -> List[str]:
+        """
+        Get the next responses received by the worker thread at once.
+        All responses are collected before an error response is raised so that later responses are not mixed up.
+        Responses still missing after a timeout arrive late and would be taken as the responses to the next
+        commands, so the client needs to be reconnected after a timeout.
+        :param count: Number of responses to be received
+        :param silence_errors: Specify whether exceptions should be silenced.
+        :param timeout: Time in seconds to wait for all the responses, defaults to waiting indefinitely.
+        :return: List of message strings without status code
+        :raises: ClientError if the client is not connected or the responses are not received in time
+        :raises: ApiException of the first error response
+        """
+        # Thread needs to be running or this will block indefinetly
+        if self.is_connected:
+            deadline = None if timeout is None else monotonic() + timeout
+            responses = []
+            error = None
+            for _ in range(count):
+                # Get the next response from the queue
+                try:
+                    response = self.recv_q.get(timeout=None if deadline is None else max(0.0, deadline - monotonic()))
+                except Empty:
+                    raise ClientError(f'Timeout after {timeout} s. Received {len(responses)} of {count} responses.')
+                self.recv_q.task_done()
+
+                # Call hook but keep on receiving after error responses, any other failure is raised immediately
+                try:
+                    responses.append(self.hook_post_receive(response, silence_errors))
+                except ApiException as e:
+                    error = error or e
+
+            if error is not None:
+                raise error
+            return responses
+        raise ClientError('Client needs to be connected before sending since this could lead to unexpected behavior.')
+
     @property
     def is_connected(self) -> bool:
         """
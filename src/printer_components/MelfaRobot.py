@@ -3,7 +3,7 @@ import threading
 import time
 from math import pi
 from time import sleep
-from typing import AnyStr, List, Optional, Union
+from typing import List, Optional, Tuple, Union
 
 import numpy as np
 from numpy import ndarray
@@ -20,6 +20,9 @@ from src.printer_components.PrinterComponent import PrinterComponent
 from src.protocols.R3Protocol import R3Protocol
 from src.protocols.R3Protocol import R3Reader
 
+# Time and speed samples of a tracked movement, both None if the speed is not tracked
+SpeedSamples = Tuple[Optional[List[float]], Optional[List[float]]]
+
 
 class MelfaRobot(PrinterComponent):
     """
@@ -29,14 +32,19 @@ class MelfaRobot(PrinterComponent):
     AXES = "XYZABC"
     INCH_IN_MM = 25.4
 
-    def __init__(self, io_client: IClient, speed_threshold=10, number_axes: int = 6, safe_return=False):
+    def __init__(self, io_client: IClient, speed_threshold: float = 10, number_axes: int = 6,
+                 safe_return: bool = False):
         """
         Initialises the robot.
-        :param io_client: Communication object
+        :param io_client: Communication object, needs to implement IClient
         :param number_axes: Number of robot AXES, declared by 'J[n]', n>=1
         :param safe_return: Flag to specify whether the robot should start and stop at its safe position
+        :raises: TypeError if the communication object does not implement IClient.
+        :raises: ValueError if the number of axes is not positive.
         """
         super().__init__(name='Melfa Robot')
+        if not isinstance(io_client, IClient):
+            raise TypeError('Communication client needs to implement IClient.')
         if number_axes <= 0:
             raise ValueError('Number of axes needs to be larger than zero.')
 
@@ -86,11 +94,8 @@ class MelfaRobot(PrinterComponent):
         sleep(0.1)
         self.activate_work_coordinate(True)
 
-        self.protocol.protocol_send('EXECTOOL (-175,0,180,0,0,0)')
-        self.protocol.client.receive()
-
-        self.protocol.protocol_send('PNRMEXTL')
-        self.protocol.client.receive()
+        # Set the tool offset and read back the standard tool coordinates
+        self.protocol.protocol_send_batch(['EXECTOOL (-175,0,180,0,0,0)', 'PNRMEXTL'])
 
     def hook_shutdown(self, *args, **kwargs) -> None:
         """
@@ -255,14 +260,12 @@ class MelfaRobot(PrinterComponent):
         :return: None
         """
         if activate:
-            # Open communication and obtain control
+            # Control is not requested if opening the communication was rejected
             self.protocol.open_communication()
             self.protocol.obtain_control()
         else:
-            # Open communication and obtain control
-            self.protocol.release_control()
-            self.protocol.close_communication()
-
+            # Releasing is best effort, the communication is closed even if releasing the control was rejected
+            self.protocol.protocol_send_batch((R3Protocol_Cmd.CNTL_OFF, R3Protocol_Cmd.COM_CLOSE))
         self.com_ctrl = activate
 
     def _change_servo_state(self, activate: bool) -> None:
@@ -273,11 +276,16 @@ class MelfaRobot(PrinterComponent):
         """
         if activate:
             self.protocol.activate_servo()
-            self.protocol.poll(self.protocol.get_servo_state, 1, timeout_ms=5000, poll_rate_ms=500)
-            sleep(1)
         else:
             self.protocol.deactivate_servo()
-            self.protocol.poll(self.protocol.get_servo_state, 0, timeout_ms=5000, poll_rate_ms=500)
+
+        # Continue as soon as the controller reports the new state instead of waiting for the worst case
+        self.protocol.poll(self.protocol.get_servo_state, int(activate),
+                           timeout_ms=R3Protocol_Cmd.SERVO_INIT_SEC * 1000, poll_rate_ms=R3Protocol_Cmd.SERVO_POLL_MS)
+
+        if activate:
+            # Let the servos settle before any motion is commanded
+            sleep(1)
 
         self.servo = activate
 
@@ -309,7 +317,7 @@ class MelfaRobot(PrinterComponent):
 
     # Movement functions
 
-    def go_home(self, option="") -> None:
+    def go_home(self, option: str = "") -> None:
         """
         Moves the robot to its current home point (current work coordinate origin or global safe position respectively)
         :return:
@@ -333,19 +341,24 @@ class MelfaRobot(PrinterComponent):
 
     def go_safe_pos(self) -> None:
         """
-        Moves the robot to its safe position.
+        Moves the robot to its safe position, unless it is already there.
         :return:
         """
         # Read safe position
         safe_pos = self.protocol.get_safe_pos()
 
+        # Confirm the actual position since the robot might have been moved by any command
+        if self.protocol.reader.get_current_joint() == safe_pos:
+            return
+
         # Go to safe position
         self.protocol.go_safe_pos()
 
         # Wait until position is reached
         self.protocol.poll(self.protocol.reader.get_current_joint, safe_pos, poll_rate_ms=1000)
 
-    def linear_move_poll(self, target_pos: Coordinate, speed: float = None, track_speed=False, current_pos=None):
+    def linear_move_poll(self, target_pos: Coordinate, speed: Optional[float] = None, track_speed: bool = False,
+                         current_pos: Optional[Coordinate] = None) -> SpeedSamples:
         """
         Moves the robot linearly to a coordinate.
         :param target_pos: Coordinate for the target position.
@@ -446,7 +459,8 @@ class MelfaRobot(PrinterComponent):
             # Wait until position is reached
             cmp_response(R3Protocol_Cmd.CURRENT_XYZABC, target_pos.to_melfa_response(), self.protocol.reader)
 
-    def get_directed_angle(self, start_pos: ndarray, target_pos: ndarray, center_pos: ndarray, is_clockwise: bool):
+    def get_directed_angle(self, start_pos: ndarray, target_pos: ndarray, center_pos: ndarray,
+                           is_clockwise: bool) -> float:
         # Determine the angle
         angle = get_angle(start_pos, target_pos, center_pos, self.active_plane)
 
@@ -461,7 +475,7 @@ class MelfaRobot(PrinterComponent):
                 angle -= 2 * pi
         return angle
 
-    def set_global_positions(self, var_names: List[AnyStr], coordinates: List[Coordinate]) -> None:
+    def set_global_positions(self, var_names: List[str], coordinates: List[Coordinate]) -> None:
         """
         Write coordinates to a global variable name in the robot memory.
         :param var_names: List of the variable names
@@ -503,7 +517,7 @@ class MelfaRobot(PrinterComponent):
 
 
 def cmp_response(poll_cmd: str, response_t: str, protocol: R3Reader, poll_rate_ms: int = 5, timeout_s: int = 60,
-                 track_speed=False):
+                 track_speed: bool = False) -> SpeedSamples:
     """
     Uses a given cmd to poll for a given response.
     :param poll_cmd: Command used to execute the poll
@@ -514,18 +528,20 @@ def cmp_response(poll_cmd: str, response_t: str, protocol: R3Reader, poll_rate_m
     :param track_speed:
     :return:
     """
-    t = 0
-    timeout_ms = timeout_s * 1000
+    poll_period_s = poll_rate_ms / 1000
+    t_end = time.monotonic() + timeout_s
     response_act = ""
 
     response_t = response_t.split(";A")[0]
 
-    time_samples = []
-    speed_samples = []
+    time_samples: List[float] = []
+    speed_samples: List[float] = []
     start_time = None
 
     # Iterate until timeout occurs or expected response is received
-    while t < timeout_ms:
+    while time.monotonic() < t_end:
+        t_poll = time.monotonic()
+
         # Handle communication
 
         if track_speed:
@@ -549,9 +565,8 @@ def cmp_response(poll_cmd: str, response_t: str, protocol: R3Reader, poll_rate_m
         if response_act.startswith(response_t):
             break
 
-        # Delay
-        sleep(poll_rate_ms / 1000)
-        t += poll_rate_ms
+        # Delay only for the remainder of the poll period since the round trip already took some of it
+        sleep(max(0.0, poll_period_s - (time.monotonic() - t_poll)))
     else:
         raise ClientError(f"Timeout after {timeout_s} seconds. Expected: '{response_t}' but got '{response_act}'")
 
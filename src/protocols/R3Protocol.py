@@ -1,5 +1,5 @@
-from time import sleep
-from typing import Tuple, Optional, Callable, List
+from time import monotonic, sleep
+from typing import Tuple, Optional, Callable, List, Sequence, Dict
 
 from src.Coordinate import Coordinate
 from src.MelfaCoordinateService import MelfaCoordinateService
@@ -12,7 +12,12 @@ VAR_READ = "VAL"
 SRV_ON = "SRVON"
 SRV_OFF = "SRVOFF"
 SRV_STATE_VAR = "M_SVO"
+COM_OPEN = "OPEN=NARCUSER"
+COM_CLOSE = "CLOSE"
+CNTL_ON = "CNTLON"
+CNTL_OFF = "CNTLOFF"
 SERVO_INIT_SEC = 5
+SERVO_POLL_MS = 50
 
 # Speed commands
 OVERRIDE_CMD = "OVRD"
@@ -38,6 +43,22 @@ TOOL_OFFSET_CMD = "TOOL"
 # Parameters for R3 protocol
 ROBOT_NO = 1
 PROGRAM_NO = 1
+CMD_PREFIX = f'{ROBOT_NO}{DELIMITER}{PROGRAM_NO}{DELIMITER}'
+
+# Joint names by number of joints, shared by all protocol objects
+_JOINT_NAMES: Dict[int, Tuple[str, ...]] = {}
+
+
+def get_joint_names(number_joints: int) -> Tuple[str, ...]:
+    """
+    Get the ordered names of the robot joints.
+    :param number_joints: Number of joints
+    :return: Tuple of the joint names: J1, J2, ...
+    """
+    try:
+        return _JOINT_NAMES[number_joints]
+    except KeyError:
+        return _JOINT_NAMES.setdefault(number_joints, tuple(f'J{i}' for i in range(1, number_joints + 1)))
 
 
 class R3SubApi:
@@ -51,13 +72,25 @@ class R3SubApi:
         self.client = client
 
     def protocol_send(self, msg: str, silent_send=False, silent_recv=False):
-        msg = f'{ROBOT_NO}{DELIMITER}{PROGRAM_NO}{DELIMITER}{msg}'
+        msg = CMD_PREFIX + msg
 
         if silent_send is False and silent_recv is False:
             self.client.send(msg)
         else:
             self.client.send(msg, silent_send=silent_send, silent_recv=silent_recv)
 
+    def protocol_send_batch(self, msgs: Sequence[str]) -> List[str]:
+        """
+        Queue several commands at once and collect their responses afterwards.
+        The next command is sent as soon as the previous response arrived instead of waiting for the caller.
+        :param msgs: Commands to be sent in order
+        :return: Responses in the order of the commands
+        :raises: Exception of the first failing command, only after all responses were collected.
+        """
+        for msg in msgs:
+            self.protocol_send(msg)
+        return self.client.receive_n(len(msgs))
+
 
 class R3Utility(R3SubApi):
     """
@@ -96,7 +129,7 @@ class R3Utility(R3SubApi):
         Sends the cmd to obtain control.
         :return: None
         """
-        self.protocol_send("CNTLON")
+        self.protocol_send(CNTL_ON)
         self.client.receive()
 
     def release_control(self) -> None:
@@ -104,7 +137,7 @@ class R3Utility(R3SubApi):
         Sends the cmd to release control.
         :return: None
         """
-        self.protocol_send("CNTLOFF")
+        self.protocol_send(CNTL_OFF)
         self.client.receive()
 
     def open_communication(self) -> None:
@@ -112,7 +145,7 @@ class R3Utility(R3SubApi):
         Sends the cmd to open the communication.
         :return: None
         """
-        self.protocol_send("OPEN=NARCUSER")
+        self.protocol_send(COM_OPEN)
         self.client.receive()
 
     def close_communication(self) -> None:
@@ -120,7 +153,7 @@ class R3Utility(R3SubApi):
         Sends the cmd to close the communication.
         :return: None
         """
-        self.protocol_send("CLOSE")
+        self.protocol_send(COM_CLOSE)
         self.client.receive()
 
 
@@ -231,7 +264,7 @@ class R3Reader(R3SubApi):
     API functions related to reading values, parameters, ...
     """
 
-    def __init__(self, client: IClient, joints: List[str], *, r2c: Callable, digits: int, **kwargs):
+    def __init__(self, client: IClient, joints: Sequence[str], *, r2c: Callable, digits: int, **kwargs):
         """
         Create an interface object for reading functions.
         :param client: Communication client
@@ -347,15 +380,17 @@ class R3Reader(R3SubApi):
         :return:
         :raises: ValueError, if the method is not listed in the pollable methods.
         """
-        # Iteratively call the method
-        total_time_waited = 0
+        poll_period_s = poll_rate_ms / 1000
+        t_end = monotonic() + timeout_ms / 1000
         response = ''
-        while total_time_waited < timeout_ms:
+
+        # Iteratively call the method, the time spent reading counts towards the poll period and the timeout
+        while monotonic() < t_end:
+            t_poll = monotonic()
             response = func()
             if response == val:
                 return
-            sleep(poll_rate_ms / 1000)
-            total_time_waited += poll_rate_ms
+            sleep(max(0.0, poll_period_s - (monotonic() - t_poll)))
         raise ClientError(f"Timeout after {timeout_ms} ms. Expected: '{val}' but got '{response}'")
 
     def _read_parameter(self, parameter: str) -> str:
@@ -625,7 +660,7 @@ class R3Protocol(R3Resetter, R3Setter, R3Reader, R3Positions, R3Utility):
         super().__init__(
             client=client,
             digits=digits,
-            joints=["J{}".format(i) for i in range(1, joints + 1)],
+            joints=get_joint_names(joints),
             coordinate2cmd=coordinate_adapter.to_cmd,
             r2c=coordinate_adapter.from_response
         )
@@ -1,6 +1,8 @@
 import os
 import sys
 import unittest.mock as mock
+from collections import namedtuple
+from functools import lru_cache
 from time import sleep
 
 import pytest
@@ -13,8 +15,12 @@ from src.clients.TcpEchoServer import DummyRobotController
 from src.GCmd import GCmd
 from src.printer_components.GPrinter import GPrinter
 
+# Minimal stand-in for the port info returned by serial.tools.list_ports.comports()
+FakeDevice = namedtuple('FakeDevice', ['vid', 'pid'])
+
 
 @pytest.fixture(
+    scope='module',
     params=[
         pytest.param(
             ('ids', 0x0403, 0x6001),
@@ -36,13 +42,16 @@ from src.printer_components.GPrinter import GPrinter
         'Virtual Ports (Linux)'
     ]
 )
-def valid_com_client(request):
-    # Parameterizable COM client
+def com_setup(request):
+    """
+    Prepare the serial setup once per module since opening the ports is expensive.
+    :param request: Parameters describing how the client is identified
+    :return: Parameters of the client
+    """
     if request.param[0] == 'ids':
         # Client is identified by USB Vendor ID and Product ID (physical hardware)
-        com = ComClient(ids=request.param[1:])
-        if com.is_available():
-            yield com
+        if ComClient(ids=request.param[1:]).is_available():
+            yield request.param
         else:
             pytest.skip('Physical device is not available.')
     elif request.param[0] == 'port':
@@ -55,10 +64,35 @@ def valid_com_client(request):
             if not echo_valid or not client_valid:
                 pytest.skip('Configured ports for windows where either not present or not virtual.')
 
-        # Client is identified by port name (virtual ports)
+        # The echo is kept open for all tests of the module
         with ConfigurableEcho(port=request.param[1]) as echo:
             echo.reconfigure(post='ok\n', msg='')
-            yield ComClient(port=request.param[2])
+            yield request.param
+
+
+def client_config(com_setup):
+    """
+    Translate the serial setup into the parameters of the client under test.
+    :param com_setup: Parameters of the serial setup
+    :return: Tuple of the IDs, the port and the boot time to wait for
+    """
+    if com_setup[0] == 'ids':
+        # Client is identified by USB Vendor ID and Product ID (physical hardware)
+        return com_setup[1:], None, ComClient.BOOT_TIME_SECONDS
+    # Client is identified by port name (virtual ports)
+    # The echo does not send a startup message so there is no need to wait for the device to boot
+    return None, com_setup[2], 0
+
+
+@pytest.fixture
+def valid_com_client(com_setup):
+    # Parameterizable COM client, a new client for each test
+    serial_ids, serial_port, boot_time = client_config(com_setup)
+    with mock.patch.object(ComClient, 'BOOT_TIME_SECONDS', boot_time):
+        com = ComClient(ids=serial_ids, port=serial_port)
+        yield com
+        # Ensure that the port is free for the next test
+        com.close()
 
 
 @pytest.fixture
@@ -71,16 +105,23 @@ def non_existing_com_client():
     return ComClient((-1, -1))
 
 
+@lru_cache(maxsize=1)
+def port_index():
+    """
+    Enumerate the serial ports once per test session, the virtual ports do not change while testing.
+    :return: Dictionary mapping the port names to their port infos
+    """
+    return {device.device: device for device in serial.tools.list_ports.comports()}
+
+
 def validate_virtual_port_win(port_name) -> bool:
     """
     Ensure that a virtual port is present and has com0com signature.
     :param port_name: String of the port name to be checked
     :return: Flag to indicate whether the specified port is valid.
     """
-    for device in serial.tools.list_ports.comports():
-        if port_name == device.device and 'com0com' in device.description:
-            return True
-    return False
+    device = port_index().get(port_name)
+    return device is not None and 'com0com' in (device.description or '')
 
 
 class TestComClient:
@@ -118,14 +159,10 @@ class TestComClient:
         # This implementation is strongly tied to the list ports functionality but rather unlikely to ever change
         with mock.patch('serial.tools.list_ports.comports') as mockfunc:
             # Create some fake devices
-            fake_device = mock.MagicMock()
-            fake_device.pid = duplicate_com_client.pid
-            fake_device.vid = duplicate_com_client.vid
+            fake_device = FakeDevice(vid=duplicate_com_client.vid, pid=duplicate_com_client.pid)
 
             # Create an arbitrary device that is not searched for connection
-            fake_device_2 = mock.MagicMock()
-            fake_device_2.pid = duplicate_com_client.pid + 1
-            fake_device_2.vid = duplicate_com_client.vid + 1
+            fake_device_2 = FakeDevice(vid=duplicate_com_client.vid + 1, pid=duplicate_com_client.pid + 1)
 
             # Check that duplicate clients are reported
             mockfunc.return_value = [fake_device, fake_device_2, fake_device]
@@ -197,7 +234,8 @@ class TestComClient:
         assert valid_com_client.is_available()
 
 
-@pytest.mark.parametrize("value,valid", [(0, True), (-1, False), (2 ** 16 - 1, True), (2 ** 16, False)])
+@pytest.mark.parametrize("value,valid", [(0, True), (-1, False), (2 ** 16 - 1, True), (2 ** 16, False),
+                                         (-2 ** 16, False), (2 ** 17 + 1, False)])
 def test_validate_id(value, valid):
     assert validate_id(value) == valid
 
@@ -205,18 +243,35 @@ def test_validate_id(value, valid):
 ROBOT_IP, ROBOT_PORT = 'localhost', 10010
 
 
-@pytest.fixture
-def virtual_environ(dummy_robot_controller, valid_com_client):
-    # Starting up server as dummy for printer
+@pytest.fixture(scope='module')
+def virtual_environ(dummy_robot_controller, com_setup):
+    """
+    Printer session shared by all tests of the module since booting the components is expensive.
+    """
+    serial_ids, serial_port, boot_time = client_config(com_setup)
+
+    # Starting up server as dummy for printer, a previous session left the servo reported as off
+    dummy_robot_controller.response_lookup[b'1;1;VALM_SVO'] = b'M_SVO=+1'
     with dummy_robot_controller:
-        serial_ids = (valid_com_client.vid, valid_com_client.pid,)
-        serial_port = valid_com_client.port
-        printer = GPrinter.default_init(ROBOT_IP, ROBOT_PORT, serial_ids=serial_ids, serial_port=serial_port)
+        with mock.patch.object(ComClient, 'BOOT_TIME_SECONDS', boot_time):
+            printer = GPrinter.default_init(ROBOT_IP, ROBOT_PORT, serial_ids=serial_ids, serial_port=serial_port)
         dummy_robot_controller.response_lookup[b'1;1;VALM_SVO'] = b'M_SVO=+0'
         yield printer, dummy_robot_controller
+        printer.shutdown()
 
 
 @pytest.fixture
+def printer_environ(virtual_environ):
+    """
+    Shared printer session restored to the default modes after each test.
+    """
+    yield virtual_environ
+    printer, _ = virtual_environ
+    for cmd_str in ('G90', 'G21'):
+        printer.execute(GCmd.read_cmd_str(cmd_str))
+
+
+@pytest.fixture(scope='module')
 def dummy_robot_controller():
     dummy = DummyRobotController(ROBOT_IP, ROBOT_PORT, 'utf-8')
     dummy.response_lookup[b'1;1;OVRD'] = b'10'
@@ -227,12 +282,11 @@ def dummy_robot_controller():
 
 class TestGPrinter:
     @pytest.mark.parametrize('cmd_str', ['G91', 'G20', 'G21', 'G222'])
-    def test_execute(self, virtual_environ, cmd_str):
+    def test_execute(self, printer_environ, cmd_str):
         """
         Test that commands are sent to all corresponding components
         :return:
         """
-        printer, dummy_robot_ctrl = virtual_environ
+        printer, dummy_robot_ctrl = printer_environ
         cmd = GCmd.read_cmd_str(cmd_str)
         printer.execute(cmd)
-        printer.shutdown()
@@ -1,13 +1,16 @@
 import unittest.mock as mock
-from time import sleep
+from time import monotonic, sleep
 from unittest.mock import MagicMock
 
 import pytest
 
+from src.ApplicationExceptions import MelfaInvalidCommand
 from src.Coordinate import Coordinate
+from src.clients.IClient import ClientError
 from src.clients.TcpClientR3 import TcpClientR3
 from src.GCmd import GCmd
-from src.printer_components.MelfaRobot import MelfaRobot
+from src.printer_components.MelfaRobot import MelfaRobot, cmp_response
+from src.protocols.R3Protocol import R3Reader
 
 
 @pytest.fixture
@@ -56,6 +59,14 @@ class TestMelfaRobot:
         a = MelfaRobot(tcp, number_axes=1)
         assert a.joints == 1
 
+    def test_client_init(self):
+        """
+        Test that the communication object is checked against the client interface.
+        :return:
+        """
+        with pytest.raises(TypeError):
+            MelfaRobot(MagicMock())
+
     def test_boot_no_safe(self, no_safe_robot):
         """
         Test that for no safe config the safe return is not called during booting.
@@ -148,20 +159,31 @@ class TestMelfaRobot:
         :return:
         """
         # Activate
-        with mock.patch.object(no_safe_robot.protocol, "open_communication", spec=mock.Mock()) as mock_com:
-            with mock.patch.object(no_safe_robot.protocol, "obtain_control", spec=mock.Mock()) as mock_control:
+        with mock.patch.object(no_safe_robot.protocol, "open_communication", spec=mock.Mock()) as mock_open:
+            with mock.patch.object(no_safe_robot.protocol, "obtain_control", spec=mock.Mock()) as mock_ctrl:
                 no_safe_robot._change_communication_state(True)
                 assert no_safe_robot.com_ctrl
-                assert mock_com.called
-                assert mock_control.called
+                mock_open.assert_called_once_with()
+                mock_ctrl.assert_called_once_with()
 
         # Deactivate
-        with mock.patch.object(no_safe_robot.protocol, "close_communication", spec=mock.Mock()) as mock_com:
-            with mock.patch.object(no_safe_robot.protocol, "release_control", spec=mock.Mock()) as mock_control:
-                no_safe_robot._change_communication_state(False)
-                assert not no_safe_robot.com_ctrl
-                assert mock_com.called
-                assert mock_control.called
+        with mock.patch.object(no_safe_robot.protocol, "protocol_send_batch", spec=mock.Mock()) as mock_func:
+            no_safe_robot._change_communication_state(False)
+            assert not no_safe_robot.com_ctrl
+            mock_func.assert_called_once_with(('CNTLOFF', 'CLOSE'))
+
+    def test__change_communication_state_rejected(self, no_safe_robot):
+        """
+        Test that control is not requested if opening the communication is rejected.
+        :param no_safe_robot:
+        :return:
+        """
+        no_safe_robot.protocol.client.receive.side_effect = MelfaInvalidCommand('7000')
+        with mock.patch.object(no_safe_robot.protocol, "protocol_send", spec=mock.Mock()) as mock_func:
+            with pytest.raises(MelfaInvalidCommand):
+                no_safe_robot._change_communication_state(True)
+        no_safe_robot.protocol.client.receive.side_effect = None
+        mock_func.assert_called_once_with('OPEN=NARCUSER')
 
     def test__change_servo_state(self, no_safe_robot):
         """
@@ -170,21 +192,25 @@ class TestMelfaRobot:
         :param no_safe_robot:
         :return:
         """
-        with mock.patch("src.printer_components.MelfaRobot.sleep", return_value=None):
+        with mock.patch("src.printer_components.MelfaRobot.sleep", return_value=None) as mock_sleep:
             with mock.patch.object(no_safe_robot.protocol, "activate_servo", spec=mock.Mock()) as mock_on:
                 with mock.patch.object(no_safe_robot.protocol, "deactivate_servo", spec=mock.Mock()) as mock_off:
-                    with mock.patch.object(no_safe_robot.protocol, "poll", spec=mock.Mock()):
+                    with mock.patch.object(no_safe_robot.protocol, "poll", spec=mock.Mock()) as mock_poll:
                         # Activate
                         no_safe_robot._change_servo_state(True)
                         assert no_safe_robot.servo
                         assert mock_on.called
                         assert not mock_off.called
+                        assert mock_poll.call_args[0][1] == 1
+                        mock_sleep.assert_called_once_with(1)
 
                         # Deactivate
                         no_safe_robot._change_servo_state(False)
                         assert not no_safe_robot.servo
                         mock_on.assert_called_once()
                         assert mock_off.called
+                        assert mock_poll.call_args[0][1] == 0
+                        mock_sleep.assert_called_once_with(1)
 
     def test_set_speed_linear(self, no_safe_robot):
         """
@@ -240,8 +266,25 @@ class TestMelfaRobot:
     def test_go_home(self):
         assert True
 
-    def test_go_safe_pos(self):
-        assert True
+    def test_go_safe_pos(self, no_safe_robot):
+        """
+        Test that the safe position is only approached if the robot is not already there.
+        :param no_safe_robot:
+        :return:
+        """
+        safe_pos = Coordinate((0, 0, 90, 0, 90, 0), "123456")
+        with mock.patch.object(no_safe_robot.protocol, "get_safe_pos", return_value=safe_pos):
+            with mock.patch.object(no_safe_robot.protocol, "go_safe_pos", spec=mock.Mock()) as mock_func:
+                with mock.patch.object(R3Reader, "get_current_joint") as mock_joint:
+                    # Robot is somewhere else
+                    mock_joint.return_value = Coordinate((0, 0, 0, 0, 0, 0), "123456")
+                    no_safe_robot.go_safe_pos()
+                    assert mock_func.call_count == 1
+
+                    # Robot is already at the safe position
+                    mock_joint.return_value = safe_pos
+                    no_safe_robot.go_safe_pos()
+                    assert mock_func.call_count == 1
 
     @pytest.mark.parametrize("speed,expected_speed", [(None, False), (100, True)])
     @pytest.mark.parametrize(
@@ -266,6 +309,27 @@ class TestMelfaRobot:
         else:
             mock_move.assert_not_called()
 
+    def test_cmp_response(self):
+        """
+        Test that the round trip counts towards the poll period and the timeout.
+        :return:
+        """
+        protocol = MagicMock()
+
+        # Slow reads reaching the target with the fifth poll, period plus round trip per poll would take 0.4 s
+        responses = iter(['other'] * 4 + ['target'])
+        protocol.client.receive.side_effect = lambda: sleep(0.04) or next(responses)
+        t_start = monotonic()
+        cmp_response('poll', 'target', protocol, poll_rate_ms=50)
+        assert monotonic() - t_start < 0.33
+
+        # Slow reads count towards the timeout
+        protocol.client.receive.side_effect = lambda: sleep(0.04) or 'other'
+        t_start = monotonic()
+        with pytest.raises(ClientError):
+            cmp_response('poll', 'target', protocol, poll_rate_ms=10, timeout_s=0.2)
+        assert monotonic() - t_start < 0.3
+
     def test_circular_move_poll(self):
         assert True
 
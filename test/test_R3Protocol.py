@@ -1,10 +1,12 @@
 import unittest.mock as mock
+from time import monotonic, sleep
 from unittest.mock import MagicMock
 
 import pytest
 
+from src.clients.IClient import ClientError
 from src.clients.TcpClientR3 import TcpClientR3
-from src.protocols.R3Protocol import R3Resetter, R3Protocol, R3Setter
+from src.protocols.R3Protocol import R3Reader, R3Resetter, R3Protocol, R3Setter, get_joint_names
 
 
 @pytest.fixture
@@ -22,6 +24,22 @@ partial_pos_api = whole_api.pos
 partial_util_api = whole_api.util
 
 
+def test_get_joint_names():
+    joints = get_joint_names(3)
+    assert joints == ('J1', 'J2', 'J3')
+    # Names are only created once
+    assert get_joint_names(3) is joints
+
+
+def test_poll_timeout():
+    # Slow reads count towards the timeout
+    slow_read = mock.Mock(side_effect=lambda: sleep(0.05) or 0)
+    t_start = monotonic()
+    with pytest.raises(ClientError):
+        R3Reader.poll(slow_read, 1, poll_rate_ms=10, timeout_ms=200)
+    assert monotonic() - t_start < 0.4
+
+
 @pytest.mark.parametrize("agent", [whole_api, reset_api, partial_reset_api])
 class TestR3ProtocolResetter:
     def test_reset_base_coordinate_system(self, agent: R3Resetter, fake_tcp):
@@ -62,6 +80,16 @@ class TestR3ProtocolResetter:
         mock_func.assert_any_call('1;1;EXECJOVRD M_NJOVRD')
 
 
+@pytest.mark.parametrize("agent", [whole_api, partial_util_api])
+class TestR3ProtocolUtility:
+    def test_protocol_send_batch(self, agent, fake_tcp):
+        agent.client = fake_tcp
+        fake_tcp.receive_n.return_value = ['QoKA', 'QoKB']
+        assert agent.protocol_send_batch(['OPEN=NARCUSER', 'CNTLON']) == ['QoKA', 'QoKB']
+        assert fake_tcp.send.call_args_list == [mock.call('1;1;OPEN=NARCUSER'), mock.call('1;1;CNTLON')]
+        fake_tcp.receive_n.assert_called_once_with(2)
+
+
 @pytest.mark.parametrize("agent", [whole_api, set_api, partial_set_api])
 class TestR3ProtocolSetter:
     def test_set_work_coordinate(self, agent: R3Setter, fake_tcp):
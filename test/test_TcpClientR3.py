@@ -1,7 +1,10 @@
+import socket
+from unittest.mock import MagicMock
+
 import pytest
 
-from src.clients.IClient import ClientError
-from src.ApplicationExceptions import ErrorDispatch
+from src.clients.IClient import ClientError, IClient, ServerClosedConnectionError
+from src.ApplicationExceptions import ErrorDispatch, MelfaUnknownCommand
 from src.clients.TcpClientR3 import validate_ip, validate_port, TcpClientR3
 from src.clients.TcpEchoServer import ConfigurableEchoServer
 
@@ -179,3 +182,76 @@ class TestTcpClientR3:
                     # Check that the response is equal to the message without the _prefix
                     response = tcp_client.receive()
                     assert response == message
+
+    @pytest.mark.timeout(10)
+    @pytest.mark.usefixtures('simple_tcp_echo')
+    @pytest.mark.parametrize("msg_list", [['Test', 'message']])
+    def test_receive_n(self, msg_list, valid_tcp_client):
+        """
+        Test that multiple responses can be received at once and that waiting for them can time out.
+        :param msg_list: List of messages to be sent
+        :param valid_tcp_client: TCP-Client configured with a valid server adress
+        :return:
+        """
+        with valid_tcp_client as tcp_client:
+            for msg in msg_list:
+                tcp_client.send(msg)
+            assert tcp_client.receive_n(len(msg_list)) == msg_list
+
+            # No further responses are pending
+            with pytest.raises(ClientError):
+                tcp_client.receive_n(1, timeout=0.1)
+
+    @pytest.mark.timeout(10)
+    def test_receive_n_exception(self, valid_tcp_client, simple_tcp_echo):
+        """
+        Test that all responses are received before an exception is raised so that the client stays in sync.
+        :param valid_tcp_client:
+        :return:
+        """
+        with valid_tcp_client as tcp_client:
+            # Error response followed by a valid response
+            simple_tcp_echo.reconfigure(pre='Qer')
+            tcp_client.wait_send('Error')
+            simple_tcp_echo.reconfigure(pre='QoK')
+            tcp_client.wait_send('Valid')
+
+            with pytest.raises(MelfaUnknownCommand, match='Error'):
+                tcp_client.receive_n(2)
+
+            # Next response belongs to the next message
+            tcp_client.send('Next')
+            assert tcp_client.receive() == 'Next'
+
+    @pytest.mark.usefixtures('simple_tcp_echo')
+    def test_nodelay(self, valid_tcp_client):
+        """
+        Test that Nagle's algorithm is disabled on the connected socket.
+        :param valid_tcp_client: TCP-Client configured with a valid server adress
+        :return:
+        """
+        with valid_tcp_client as tcp_client:
+            assert tcp_client.s.getsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY) != 0
+
+
+def test_receive_n_default():
+    """
+    Test that clients without their own implementation receive multiple responses one by one.
+    :return:
+    """
+    client = MagicMock()
+    client.receive.side_effect = ['a', MelfaUnknownCommand('b'), 'c']
+    with pytest.raises(MelfaUnknownCommand):
+        IClient.receive_n(client, 3)
+    # All responses are received before raising
+    assert client.receive.call_count == 3
+
+    client.receive.side_effect = ['a', 'b']
+    assert IClient.receive_n(client, 2) == ['a', 'b']
+
+    # Other failures are not delayed
+    client.receive.reset_mock()
+    client.receive.side_effect = [ServerClosedConnectionError(), 'b']
+    with pytest.raises(ServerClosedConnectionError):
+        IClient.receive_n(client, 2)
+    assert client.receive.call_count == 1
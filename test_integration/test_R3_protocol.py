@@ -67,6 +67,10 @@ class TestR3ProtocolUtil:
     def test_close_communication(self, protocol, echo_server, prefix, exc):
         self.execute_report_failures(echo_server, protocol.close_communication, prefix, exc)
 
+    def test_protocol_send_batch(self, protocol, echo_server, prefix, exc):
+        self.execute_report_failures(echo_server, lambda: protocol.protocol_send_batch(['CNTLOFF', 'CLOSE']), prefix,
+                                     exc)
+
 
 @pytest.mark.skip(reason='Not implemented.')
 @pytest.mark.usefixtures('echo_server')